@@ -12,6 +12,10 @@ import os
 import sys
 import asyncio
 import logging
+import logging.handlers
+import queue
+import contextvars
+import atexit
 import json
 import signal
 import threading
@@ -31,12 +35,141 @@ from telegram.ext import (
 from telegram.error import TelegramError, TimedOut, RetryAfter, Conflict, NetworkError
 
 # ==================== LOGGING ====================
-logging.basicConfig(
-    format='%(asctime)s | %(levelname)s | %(message)s',
-    level=logging.INFO,
-    stream=sys.stdout
-)
+# Log kayıtları event loop'ta sadece kuyruğa atılır; biçimlendirme ve stdout
+# yazımı QueueListener thread'inde yapılır.
+LOG_RATE_LIMIT = 5        # Aynı hata şablonu için pencere başına izin verilen kayıt
+LOG_RATE_WINDOW = 60.0    # saniye
+
+# İşlenen update'in id'si - her log kaydına korelasyon id'si olarak eklenir
+current_update_id = contextvars.ContextVar("update_id", default=None)
+
+class UpdateContextFilter(logging.Filter):
+    """Kayda aktif update id'sini ekle (log çağrısının yapıldığı thread'de çalışır)"""
+    def filter(self, record):
+        if not hasattr(record, "update_id"):
+            record.update_id = current_update_id.get()
+        return True
+
+class RateLimitFilter(logging.Filter):
+    """Tekrarlayan WARNING+ kayıtlarını şablon bazında sınırla, bastırılanları özetle"""
+    def __init__(self, limit: int = LOG_RATE_LIMIT, window: float = LOG_RATE_WINDOW):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING or getattr(record, "rate_limit_summary", False):
+            return True
+        # Lazy format sayesinde record.msg şablondur: "Mesaj hatası (%s): %s"
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        expired = None
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None and now - bucket[0] >= self.window:
+                # Pencere bitti; timer'dan önce geldiysek özeti burada bas
+                if bucket[2]:
+                    expired = bucket
+                bucket = None
+            if bucket is None:
+                # [pencere başı, izin verilen, bastırılan, ilk bastırılanın update_id'si]
+                bucket = self._buckets[key] = [now, 0, 0, None]
+            allowed = bucket[1] < self.limit
+            if allowed:
+                bucket[1] += 1
+            else:
+                if not bucket[2]:
+                    bucket[3] = current_update_id.get()
+                    # Pencere bitince özet kaydı bas ve bucket'ı sıfırla
+                    timer = threading.Timer(bucket[0] + self.window - now, self._flush_bucket, (key, bucket))
+                    timer.daemon = True
+                    timer.start()
+                bucket[2] += 1
+        if expired:
+            self._emit_summary(key, expired[2], expired[3])
+        return allowed
+
+    def _flush_bucket(self, key, bucket):
+        with self._lock:
+            if self._buckets.get(key) is not bucket:
+                return
+            del self._buckets[key]
+        self._emit_summary(key, bucket[2], bucket[3])
+
+    def flush(self):
+        """Bekleyen tüm bastırma sayılarını özet olarak bas (kapanışta)"""
+        with self._lock:
+            pending = [(key, b[2], b[3]) for key, b in self._buckets.items() if b[2]]
+            self._buckets.clear()
+        for key, suppressed, update_id in pending:
+            self._emit_summary(key, suppressed, update_id)
+
+    def _emit_summary(self, key, suppressed, update_id):
+        name, level, template = key
+        logging.getLogger(name).log(
+            level, "repeated log suppressed %d times in the last %gs", suppressed, self.window,
+            extra={"update_id": update_id, "suppressed": suppressed, "template": template,
+                   "rate_limit_summary": True}
+        )
+
+class JsonFormatter(logging.Formatter):
+    """Tek satır JSON log kaydı"""
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        update_id = getattr(record, "update_id", None)
+        if update_id is not None:
+            entry["update_id"] = update_id
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+            entry["template"] = getattr(record, "template", None)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """Kaydı biçimlendirmeden kuyruğa at - format işi listener thread'ine kalır"""
+    def prepare(self, record):
+        return record
+
+def setup_logging():
+    """Root logger'ı kuyruk + arka plan listener ile kur"""
+    log_queue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    queue_handler = LazyQueueHandler(log_queue)
+    queue_handler.addFilter(UpdateContextFilter())
+
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(queue_handler)
+    root.setLevel(logging.INFO)
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    # Kapanışta kuyrukta kalan kayıtları boşalt
+    atexit.register(listener.stop)
+
+    # Rate limit sadece kullanıcı başına gönderim döngülerinde (/scan, /notify_expired);
+    # genel hata kayıtları asla bastırılmaz
+    rate_limiter = RateLimitFilter()
+    logging.getLogger("MalibuBot.broadcast").addFilter(rate_limiter)
+    # atexit LIFO: özetler listener durmadan önce kuyruğa girer
+    atexit.register(rate_limiter.flush)
+    return listener
+
+log_listener = setup_logging()
 log = logging.getLogger("MalibuBot")
+broadcast_log = logging.getLogger("MalibuBot.broadcast")
 logging.getLogger("httpx").setLevel(logging.ERROR)
 logging.getLogger("telegram").setLevel(logging.WARNING)
 
@@ -97,12 +230,12 @@ async def save_to_sheets(data: dict) -> bool:
         async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
             response = await client.post(SHEETS_WEBHOOK, json=data)
             if response.status_code == 200:
-                log.info(f"✅ Sheets'e kaydedildi: {data.get('tradingview', '?')}")
+                log.info("✅ Sheets'e kaydedildi: %s", data.get('tradingview', '?'))
                 return True
             else:
-                log.error(f"Sheets error: {response.status_code}")
+                log.error("Sheets error: %s", response.status_code)
     except Exception as e:
-        log.error(f"Sheets webhook error: {e}")
+        log.error("Sheets webhook error: %s", e)
     return False
 
 async def get_expired_users() -> list:
@@ -116,7 +249,7 @@ async def get_expired_users() -> list:
             if response.status_code == 200:
                 return response.json()
     except Exception as e:
-        log.error(f"Get expired error: {e}")
+        log.error("Get expired error: %s", e)
     return []
 
 # ==================== HELPERS ====================
@@ -130,7 +263,7 @@ async def cmd_start(update: Update, context):
     user = update.effective_user
     args = context.args if context.args else []
     
-    log.info(f"START: {user.id} - args: {args}")
+    log.info("START: %s - args: %s", user.id, args)
     
     # Deep link'ten plan al
     plan_key = args[0] if args else None
@@ -302,7 +435,7 @@ async def save_request(user, context, txid: str):
                 reply_markup=InlineKeyboardMarkup(keyboard)
             )
         except Exception as e:
-            log.error(f"Admin bildirim hatası: {e}")
+            log.error("Admin bildirim hatası: %s", e)
 
 async def admin_callback(update: Update, context):
     """Admin onay/red işlemleri"""
@@ -412,7 +545,7 @@ async def cmd_notify_expired(update: Update, context):
                 sent += 1
                 await asyncio.sleep(0.15)
         except Exception as e:
-            log.warning(f"Bildirim gönderilemedi {user.get('telegram_id')}: {e}")
+            broadcast_log.warning("Bildirim gönderilemedi %s: %s", user.get('telegram_id'), e)
     
     await update.message.reply_text(f"📨 {sent}/{expired_count} kişiye bildirim gönderildi.")
 
@@ -454,7 +587,7 @@ async def cmd_scan(update: Update, context):
                     await asyncio.sleep(0.15)
                 except Exception as e:
                     errors += 1
-                    log.error(f"Mesaj hatası ({raw_id}): {e}")
+                    broadcast_log.error("Mesaj hatası (%s): %s", raw_id, e)
             else:
                 # ID "Yok" veya geçersiz olanlar
                 no_id += 1
@@ -471,7 +604,7 @@ async def cmd_scan(update: Update, context):
         await status_msg.edit_text(report, parse_mode="Markdown")
         
     except Exception as e:
-        log.error(f"Scan error: {e}")
+        log.error("Scan error: %s", e)
         await status_msg.edit_text(f"❌ Tarama sırasında teknik hata oluştu: {e}")
 
 async def cmd_sync(update: Update, context):
@@ -565,7 +698,11 @@ async def run_bot():
             )
             for upd in updates:
                 offset = upd.update_id + 1
-                await application.process_update(upd)
+                token = current_update_id.set(upd.update_id)
+                try:
+                    await application.process_update(upd)
+                finally:
+                    current_update_id.reset(token)
         except TimedOut:
             continue
         except RetryAfter as e:
@@ -574,11 +711,11 @@ async def run_bot():
             log.error("CONFLICT - başka bot çalışıyor!")
             await asyncio.sleep(30)
         except (NetworkError, TelegramError) as e:
-            log.warning(f"Ağ hatası: {e}")
+            log.warning("Ağ hatası: %s", e)
             await asyncio.sleep(5)
         except Exception as e:
             BOT_STATUS["errors"] += 1
-            log.error(f"Hata: {e}")
+            log.error("Hata: %s", e)
             await asyncio.sleep(5)
     
     await application.stop()
@@ -588,7 +725,7 @@ def bot_thread():
     """Bot thread'i"""
     while not SHUTDOWN.is_set():
         BOT_STATUS["restarts"] += 1
-        log.info(f"🚀 Bot başlatılıyor (#{BOT_STATUS['restarts']})")
+        log.info("🚀 Bot başlatılıyor (#%s)", BOT_STATUS['restarts'])
         
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -596,7 +733,7 @@ def bot_thread():
         try:
             loop.run_until_complete(run_bot())
         except Exception as e:
-            log.error(f"Bot çöktü: {e}")
+            log.error("Bot çöktü: %s", e)
             BOT_STATUS["running"] = False
         finally:
             loop.close()
@@ -637,9 +774,9 @@ def main():
     
     log.info("=" * 50)
     log.info("🌴 Malibu Telegram Bot v1.0")
-    log.info(f"📊 Sheets Webhook: {'✅' if SHEETS_WEBHOOK else '❌'}")
-    log.info(f"👤 Admin ID: {ADMIN_ID}")
-    log.info(f"🔌 Port: {PORT}")
+    log.info("📊 Sheets Webhook: %s", '✅' if SHEETS_WEBHOOK else '❌')
+    log.info("👤 Admin ID: %s", ADMIN_ID)
+    log.info("🔌 Port: %s", PORT)
     log.info("=" * 50)
     
     # Bot thread
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Log pipeline kontrolü - RateLimitFilter ve JsonFormatter
+Çalıştırma: python test_logging.py
+"""
+import json
+import logging
+import time
+
+from bot import RateLimitFilter, JsonFormatter, current_update_id
+
+WINDOW = 0.3
+
+class ListHandler(logging.Handler):
+    """Kayıtları listede topla"""
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+def make_logger(name: str, limit: int = 2):
+    logger = logging.getLogger(f"test.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    limiter = RateLimitFilter(limit=limit, window=WINDOW)
+    handler = ListHandler()
+    logger.addFilter(limiter)
+    logger.addHandler(handler)
+    return logger, limiter, handler.records
+
+def summaries(records):
+    return [r for r in records if getattr(r, "rate_limit_summary", False)]
+
+def test_burst_summary():
+    """Burst: limit kadar kayıt geçer, pencere sonunda tek özet basılır"""
+    logger, _, records = make_logger("burst")
+    token = current_update_id.set(42)
+    try:
+        for i in range(5):
+            logger.error("Mesaj hatası (%s): %s", i, "boom")
+        logger.info("info kayıtları sınırlanmaz")
+    finally:
+        current_update_id.reset(token)
+
+    assert [r.getMessage() for r in records] == [
+        "Mesaj hatası (0): boom", "Mesaj hatası (1): boom", "info kayıtları sınırlanmaz"
+    ]
+    time.sleep(WINDOW + 0.2)
+
+    [summary] = summaries(records)
+    assert summary.levelno == logging.ERROR
+    assert summary.name == "test.burst"
+    assert summary.suppressed == 3
+    assert summary.update_id == 42
+    assert summary.template == "Mesaj hatası (%s): %s"
+    assert "%s" not in summary.getMessage()
+
+    entry = json.loads(JsonFormatter().format(summary))
+    assert entry["suppressed"] == 3
+    assert entry["update_id"] == 42
+    assert entry["template"] == "Mesaj hatası (%s): %s"
+
+def test_window_resets():
+    """Pencere bitince kota yenilenir - seyrek hatalar asla bastırılmaz"""
+    logger, _, records = make_logger("window")
+    for i in range(3):
+        logger.error("Mesaj hatası (%s): %s", i, "boom")
+        time.sleep(WINDOW / 2 + 0.05)
+    time.sleep(WINDOW + 0.1)
+    logger.error("Mesaj hatası (%s): %s", 99, "later")
+    time.sleep(WINDOW + 0.1)
+
+    assert summaries(records) == []
+    assert [r.getMessage() for r in records][-1] == "Mesaj hatası (99): later"
+
+def test_summary_before_timer():
+    """Pencere sonrası gelen kayıt hem özetlenir hem kendisi geçer"""
+    logger, limiter, records = make_logger("late", limit=1)
+    logger.error("Ağ: %s", "a")
+    logger.error("Ağ: %s", "b")
+    # Timer'ı beklemeden pencereyi bitmiş say
+    for bucket in limiter._buckets.values():
+        bucket[0] -= WINDOW
+    logger.error("Ağ: %s", "c")
+    time.sleep(WINDOW + 0.1)
+
+    messages = [r.getMessage() for r in records if not getattr(r, "rate_limit_summary", False)]
+    assert messages == ["Ağ: a", "Ağ: c"]
+    [summary] = summaries(records)
+    assert summary.suppressed == 1
+
+def test_flush_at_exit():
+    """flush(): bekleyen sayılar timer beklemeden basılır, timer tekrar basmaz"""
+    logger, limiter, records = make_logger("flush")
+    for i in range(6):
+        logger.warning("Bildirim gönderilemedi %s: %s", i, "x")
+    limiter.flush()
+
+    [summary] = summaries(records)
+    assert summary.levelno == logging.WARNING
+    assert summary.suppressed == 4
+    time.sleep(WINDOW + 0.1)
+    assert len(summaries(records)) == 1
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")